@@ -9,6 +9,7 @@ from .sprt import (
     SPRTResult,
     load_openings,
     elo_with_confidence,
+    elo_with_confidence_vec,
 )
 
 __all__ = [
@@ -23,4 +24,5 @@ __all__ = [
     "SPRTResult",
     "load_openings",
     "elo_with_confidence",
+    "elo_with_confidence_vec",
 ]
@@ -0,0 +1,49 @@
+"""Per-game SPRT bookkeeping, JIT-compiled with numba when it is installed."""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below run as plain Python without it.
+
+    def njit(*args, **kwargs):
+        def decorate(func):
+            return func
+
+        return decorate
+
+
+@njit(cache=True)
+def _sprt_update(
+    scores: np.ndarray,
+    plies: np.ndarray,
+    llr: float,
+    lr_a: float,
+    lr_b: float,
+    lower: float,
+    upper: float,
+    llr_out: np.ndarray,
+) -> tuple[float, int, np.ndarray, int, int, int]:
+    """Fold a batch of game results into the running LLR, stopping at the first bound crossing.
+
+    ``llr`` is the LLR before the batch and ``llr_out`` receives the running value after each game.
+    Returns ``(llr, idx_stopped, penta, wins_a, wins_b, draws)``; ``idx_stopped`` is the batch index of
+    the game that crossed a bound, or -1, and the counters cover only games up to that point.
+    """
+    penta = np.zeros(5, dtype=np.int64)
+    wins_a = wins_b = draws = 0
+    for idx in range(scores.shape[0]):
+        score = scores[idx]
+        llr += score * lr_a + (1.0 - score) * lr_b
+        llr_out[idx] = llr
+        penta[min(plies[idx] // 20, 4)] += 1
+        if score == 1.0:
+            wins_a += 1
+        elif score == 0.0:
+            wins_b += 1
+        else:
+            draws += 1
+        if llr >= upper or llr <= lower:
+            return llr, idx, penta, wins_a, wins_b, draws
+    return llr, -1, penta, wins_a, wins_b, draws
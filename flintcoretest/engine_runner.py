@@ -1,42 +1,76 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Callable, Iterable, Sequence
+import asyncio
+import functools
 import os
+import queue
+import re
+import select
+import selectors
+import signal
+import stat
 import subprocess
+import sys
+import threading
+import time
 
 from .perft_cases import PerftExpectation
 
 
+_HANDSHAKE = ("uci", "isready")
+# Asks FlintCore to print only the perft total instead of one divide line per root move; engines that
+# do not know the option ignore it.
+_PERFT_BULK_OPTION = "setoption name PerftBulkOnly value true"
+_INIT_COMMANDS = ("uci", _PERFT_BULK_OPTION, "isready")
+# Perft totals are printed at the very end, so only this many trailing lines are retained while reading.
+_PERFT_TAIL_LINES = 64
+# select() only accepts sockets on Windows, where a reader thread feeds engine output into a queue instead.
+_SELECT_PIPES = os.name == "posix"
+# Matches both the ``perft`` ("Total nodes: N") and ``go perft`` ("nodes N") totals.
+_PERFT_RE = re.compile(rb"(?i)^[ \t]*(?:total nodes[ \t]*:[ \t]*|nodes[ \t]+)(\d+)\s*$")
+
+
 class EngineNotFoundError(RuntimeError):
     """Raised when the FlintCore executable cannot be located."""
 
 
 @dataclass
 class CommandResult:
-    """Holds stdout/stderr for a finished process."""
+    """Holds raw stdout/stderr bytes for a finished process; lines are decoded on first access."""
 
-    stdout: str
-    stderr: str
+    stdout: bytes
+    stderr: bytes
 
-    @property
+    @cached_property
     def stdout_lines(self) -> list[str]:
-        return [line.rstrip("\r\n") for line in self.stdout.splitlines()]
+        return [line.decode("utf-8", "replace").rstrip("\r\n") for line in self.stdout.splitlines()]
 
-    @property
+    @cached_property
     def stderr_lines(self) -> list[str]:
-        return [line.rstrip("\r\n") for line in self.stderr.splitlines()]
+        return [line.decode("utf-8", "replace").rstrip("\r\n") for line in self.stderr.splitlines()]
 
 
 def _resolve(path_str: str | None) -> Path | None:
     if not path_str:
         return None
-    return Path(path_str).expanduser().resolve()
+    return Path(os.path.realpath(os.path.expanduser(path_str)))
+
+
+def _is_executable(path: Path) -> bool:
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return False
+    return stat.S_ISREG(mode) and bool(mode & 0o111)
 
 
 def _candidate_engine_paths() -> list[Path]:
-    repo_root = Path(__file__).resolve().parents[1]
+    repo_root = Path(os.path.realpath(__file__)).parents[1]
     workspace = repo_root.parent
 
     env_engine = _resolve(os.environ.get("FLINTCORE_ENGINE_PATH"))
@@ -70,12 +104,7 @@ def _candidate_engine_paths() -> list[Path]:
     seen: set[Path] = set()
     ordered: list[Path] = []
     for cand in candidates:
-        if not cand:
-            continue
-        try:
-            resolved = cand.resolve()
-        except FileNotFoundError:
-            resolved = cand
+        resolved = Path(os.path.realpath(cand))
         if resolved in seen:
             continue
         seen.add(resolved)
@@ -83,9 +112,15 @@ def _candidate_engine_paths() -> list[Path]:
     return ordered
 
 
+@functools.lru_cache(maxsize=1)
 def discover_engine_binary() -> Path:
+    """Locate the FlintCore executable, caching the answer for the rest of the process.
+
+    Changes to the ``FLINTCORE_*`` environment variables made after the first successful call are
+    not seen until ``discover_engine_binary.cache_clear()`` is called.
+    """
     for cand in _candidate_engine_paths():
-        if cand.is_file() and os.access(cand, os.X_OK):
+        if _is_executable(cand):
             return cand
     raise EngineNotFoundError(
         "Could not locate a FlintCore executable. Set FLINTCORE_ENGINE_PATH or run scripts/build_engine.py."
@@ -99,87 +134,332 @@ def _ensure_quit(commands: Sequence[str]) -> list[str]:
     return lines
 
 
-def _parse_perft_nodes(output: str) -> int:
-    for line in reversed(output.splitlines()):
-        stripped = line.strip()
-        lower = stripped.lower()
-        if lower.startswith("total nodes:"):
-            return int(stripped.split(":", 1)[1].strip())
-        if lower.startswith("nodes "):
-            return int(stripped.split()[1])
-    raise ValueError(f"Unable to parse perft nodes from output:\n{output}")
-
-
-def _position_command(case: PerftExpectation) -> str:
-    if case.startpos:
-        base = "position startpos"
-    elif case.fen:
-        base = f"position fen {case.fen}"
-    else:
-        raise ValueError(f"Perft case '{case.name}' missing FEN/startpos")
-    if case.moves:
-        base += " moves " + " ".join(case.moves)
-    return base
+def _spawn_engine(args: Sequence[str], stdin_data: bytes, timeout: float) -> tuple[bytes, bytes]:
+    """Run ``args`` to completion with ``stdin_data`` as input, like ``subprocess.run(check=True)``.
+
+    On Linux the child is started with ``os.posix_spawn``, which avoids the fork path ``subprocess``
+    takes with its default ``close_fds=True``; other platforms fall back to ``subprocess.run``.
+    """
+    if sys.platform != "linux":
+        proc = subprocess.run(list(args), input=stdin_data, capture_output=True, timeout=timeout, check=True)
+        return proc.stdout, proc.stderr
+
+    # os.pipe() descriptors are close-on-exec, so the child only keeps the dup2'd copies on 0/1/2.
+    in_r, in_w = os.pipe()
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    open_fds = {in_w, out_r, err_r}
+    try:
+        pid = os.posix_spawn(
+            args[0],
+            list(args),
+            os.environ,
+            file_actions=[
+                (os.POSIX_SPAWN_DUP2, in_r, 0),
+                (os.POSIX_SPAWN_DUP2, out_w, 1),
+                (os.POSIX_SPAWN_DUP2, err_w, 2),
+            ],
+            # Python ignores these at start-up; restore the defaults like subprocess's restore_signals.
+            setsigdef=(signal.SIGPIPE, signal.SIGXFSZ),
+        )
+    except BaseException:
+        for fd in open_fds:
+            os.close(fd)
+        raise
+    finally:
+        for fd in (in_r, out_w, err_w):
+            os.close(fd)
+
+    output: dict[int, list[bytes]] = {out_r: [], err_r: []}
+    pending = memoryview(stdin_data)
+    deadline = time.monotonic() + timeout
+    status: int | None = None
+    try:
+        with selectors.DefaultSelector() as sel:
+            os.set_blocking(in_w, False)
+            sel.register(in_w, selectors.EVENT_WRITE)
+            sel.register(out_r, selectors.EVENT_READ)
+            sel.register(err_r, selectors.EVENT_READ)
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(list(args), timeout, b"".join(output[out_r]))
+                for key, _ in sel.select(remaining):
+                    fd = key.fd
+                    if fd == in_w:
+                        try:
+                            pending = pending[os.write(fd, pending[: select.PIPE_BUF]) :]
+                        except BrokenPipeError:
+                            pending = pending[:0]
+                        done = not pending
+                    else:
+                        chunk = os.read(fd, 65536)
+                        output[fd].append(chunk)
+                        done = not chunk
+                    if done:
+                        sel.unregister(fd)
+                        os.close(fd)
+                        open_fds.discard(fd)
+
+        # Closing its output does not mean the child has exited, so the deadline still applies here.
+        delay = 0.0005
+        while True:
+            waited, wait_status = os.waitpid(pid, os.WNOHANG)
+            if waited:
+                status = wait_status
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(list(args), timeout, b"".join(output[out_r]))
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.05)
+    except BaseException:
+        if status is None:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        raise
+    finally:
+        for fd in open_fds:
+            os.close(fd)
+
+    returncode = os.waitstatus_to_exitcode(status)
+    stdout, stderr = b"".join(output[out_r]), b"".join(output[err_r])
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, list(args), stdout, stderr)
+    return stdout, stderr
+
+
+def _pump(stream: Any, chunks: queue.Queue[bytes]) -> None:
+    while True:
+        try:
+            chunk = stream.read(65536)
+        except (OSError, ValueError):
+            chunk = b""
+        chunks.put(chunk)
+        if not chunk:
+            return
 
 
 class EngineHarness:
-    """Thin wrapper around the FlintCore executable for tests and CI."""
+    """Thin wrapper around the FlintCore executable for tests and CI.
+
+    Perft and search helpers talk to one long-lived engine process over UCI so repeated calls do not
+    pay process start-up each time.  Use the harness as a context manager (or call ``close``) to shut
+    that process down; ``run_uci_script`` and ``run_bench`` still launch one-off processes.
+    """
 
     def __init__(self, engine_path: str | Path | None = None, timeout: float = 60.0):
         resolved = Path(engine_path).expanduser().resolve() if engine_path else discover_engine_binary()
-        if not resolved.is_file() or not os.access(resolved, os.X_OK):
+        if not _is_executable(resolved):
             raise EngineNotFoundError(f"Engine binary is not executable: {resolved}")
         self.engine_path = resolved
         self.timeout = timeout
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._lines: deque[bytes] = deque()
+        self._partial = b""
+        self._chunks: queue.Queue[bytes] | None = None
+
+    def __enter__(self) -> EngineHarness:
+        self._ensure_proc()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        proc = self._proc
+        if proc is None:
+            return
+        self._proc = None
+        try:
+            proc.stdin.write(b"quit\n")
+            proc.stdin.flush()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        finally:
+            proc.stdin.close()
+            proc.stdout.close()
+
+    def _ensure_proc(self) -> subprocess.Popen[bytes]:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        self.close()
+        self._lines.clear()
+        self._partial = b""
+        self._proc = subprocess.Popen(
+            [str(self.engine_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        self._chunks = None if _SELECT_PIPES else queue.Queue()
+        if self._chunks is not None:
+            threading.Thread(target=_pump, args=(self._proc.stdout, self._chunks), daemon=True).start()
+        # Written directly rather than through _send, which would re-enter here if the engine died at once.
+        self._proc.stdin.write("".join(f"{cmd}\n" for cmd in _INIT_COMMANDS).encode())
+        self._proc.stdin.flush()
+        self._read_until(lambda line: line == b"readyok")
+        return self._proc
+
+    def _send(self, *commands: str) -> None:
+        proc = self._ensure_proc()
+        proc.stdin.write("".join(f"{cmd}\n" for cmd in commands).encode())
+        proc.stdin.flush()
+
+    def _read_until(
+        self,
+        predicate: Callable[[bytes], object],
+        timeout: float | None = None,
+        keep: int | None = None,
+    ) -> list[bytes]:
+        """Collect engine output lines up to and including the first one matching ``predicate``.
+
+        When ``keep`` is given only that many trailing lines are held in memory.
+        """
+        proc = self._proc
+        assert proc is not None and proc.stdout is not None
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        lines: deque[bytes] = deque(maxlen=keep)
+        while True:
+            while self._lines:
+                line = self._lines.popleft().rstrip(b"\r")
+                lines.append(line)
+                if predicate(line):
+                    return list(lines)
+            chunk = self._read_chunk(proc, deadline - time.monotonic())
+            if chunk is None:
+                self._kill()
+                raise subprocess.TimeoutExpired([str(self.engine_path)], timeout, output=b"\n".join(lines))
+            if not chunk:
+                # A closed stdout does not mean the engine has exited, so the deadline still applies.
+                try:
+                    returncode = proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    self._kill()
+                    output = b"\n".join(lines)
+                    raise subprocess.TimeoutExpired([str(self.engine_path)], timeout, output=output) from None
+                self._kill()
+                raise subprocess.CalledProcessError(returncode, [str(self.engine_path)], output=b"\n".join(lines))
+            *complete, self._partial = (self._partial + chunk).split(b"\n")
+            self._lines.extend(complete)
+
+    def _read_chunk(self, proc: subprocess.Popen[bytes], remaining: float) -> bytes | None:
+        """Return the next block of engine output, ``b""`` at EOF, or ``None`` if none arrives in time."""
+        if remaining <= 0:
+            return None
+        if self._chunks is not None:
+            try:
+                return self._chunks.get(timeout=remaining)
+            except queue.Empty:
+                return None
+        fd = proc.stdout.fileno()
+        if not select.select([fd], [], [], remaining)[0]:
+            return None
+        return os.read(fd, 65536)
+
+    def _kill(self) -> None:
+        # Output from an abandoned command would corrupt the next exchange, so start afresh.
+        if self._proc is not None:
+            self._proc.kill()
+        self.close()
+
+    def _perft(self, script: Sequence[str]) -> int:
+        self._send(*script)
+        lines = self._read_until(_PERFT_RE.match, timeout=max(self.timeout, 90.0), keep=_PERFT_TAIL_LINES)
+        # Drain anything printed after the total so the next command starts from a clean stream.
+        self._send("isready")
+        self._read_until(lambda line: line == b"readyok")
+        return int(_PERFT_RE.match(lines[-1]).group(1))
 
     def run_uci_script(self, commands: Sequence[str], timeout: float | None = None) -> CommandResult:
-        script_lines = _ensure_quit(commands)
-        script = "\n".join(script_lines) + "\n"
-        proc = subprocess.run(
-            [str(self.engine_path)],
-            input=script,
-            capture_output=True,
-            text=True,
-            timeout=timeout or self.timeout,
-            check=True,
+        script = "\n".join(_ensure_quit(commands)) + "\n"
+        stdout, stderr = _spawn_engine([str(self.engine_path)], script.encode(), timeout or self.timeout)
+        return CommandResult(stdout, stderr)
+
+    async def _run_uci_streaming_async(
+        self,
+        commands: Sequence[str],
+        stop_predicate: Callable[[bytes], Any],
+        timeout: float | None = None,
+    ) -> Any:
+        """Run ``commands`` in a fresh engine and return the first truthy ``stop_predicate(line)``.
+
+        The engine is sent ``quit`` as soon as the predicate fires rather than being read to EOF; returns
+        ``None`` if it exits first.  ``timeout`` covers both the scan and the shutdown.
+        """
+        args = [str(self.engine_path)]
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
-        return CommandResult(proc.stdout, proc.stderr)
+
+        async def _scan() -> Any:
+            proc.stdin.write("".join(f"{cmd}\n" for cmd in commands).encode())
+            async for line in proc.stdout:
+                result = stop_predicate(line.rstrip(b"\r\n"))
+                if result:
+                    return result
+            return None
+
+        try:
+            result = await asyncio.wait_for(_scan(), timeout)
+            # Whatever the engine prints after the answer is read and dropped while it shuts down.
+            await asyncio.wait_for(proc.communicate(b"quit\n"), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise subprocess.TimeoutExpired(args, timeout) from None
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, args)
+        return result
 
     def handshake(self) -> CommandResult:
-        return self.run_uci_script(["uci", "isready"])
+        self._send(*_HANDSHAKE)
+        lines = self._read_until(lambda line: line == b"readyok")
+        return CommandResult(b"\n".join(lines) + b"\n", b"")
 
     def go_perft(self, case: PerftExpectation) -> int:
-        commands = [
-            "uci",
-            "isready",
-            "ucinewgame",
-            _position_command(case),
-            f"go perft {case.depth}",
-        ]
-        result = self.run_uci_script(commands, timeout=max(self.timeout, 90.0))
-        return _parse_perft_nodes(result.stdout)
+        return self._perft(case.go_perft_script)
 
     def perft_command(self, case: PerftExpectation) -> int:
-        commands = [
-            "uci",
-            "isready",
-            "ucinewgame",
-            _position_command(case),
-            f"perft {case.depth}",
-        ]
-        result = self.run_uci_script(commands, timeout=max(self.timeout, 90.0))
-        return _parse_perft_nodes(result.stdout)
+        return self._perft(case.perft_script)
+
+    async def go_perft_async(self, case: PerftExpectation) -> int:
+        """Run ``go perft`` for ``case`` in its own engine process."""
+        match = await self._run_uci_streaming_async(
+            _INIT_COMMANDS + case.go_perft_script,
+            _PERFT_RE.match,
+            timeout=max(self.timeout, 90.0),
+        )
+        if match is None:
+            raise ValueError(f"Engine exited without reporting perft nodes for '{case.name}'")
+        return int(match.group(1))
+
+    def gather_perft(self, cases: Iterable[PerftExpectation]) -> list[int]:
+        """Run every case concurrently, one engine process each, returning node counts in order."""
+
+        async def _gather() -> list[int]:
+            return list(await asyncio.gather(*(self.go_perft_async(case) for case in cases)))
+
+        return asyncio.run(_gather())
 
     def run_simple_search(self, moves: Iterable[str] | None = None, depth: int = 1) -> CommandResult:
         moves_str = " moves " + " ".join(moves) if moves else ""
-        commands = [
-            "uci",
-            "isready",
-            "ucinewgame",
-            f"position startpos{moves_str}",
-            f"go depth {depth}",
-        ]
-        return self.run_uci_script(commands)
+        self._send("ucinewgame", f"position startpos{moves_str}", f"go depth {depth}")
+        lines = self._read_until(lambda line: line.startswith(b"bestmove "))
+        return CommandResult(b"\n".join(lines) + b"\n", b"")
 
     def run_bench(self, extra_args: Sequence[str] | None = None, timeout: float | None = None) -> CommandResult:
         args = [str(self.engine_path)]
@@ -187,11 +467,5 @@ class EngineHarness:
             args.extend(extra_args)
         else:
             args.append("bench")
-        proc = subprocess.run(
-            args,
-            capture_output=True,
-            text=True,
-            timeout=timeout or max(self.timeout, 120.0),
-            check=True,
-        )
-        return CommandResult(proc.stdout, proc.stderr)
+        stdout, stderr = _spawn_engine(args, b"", timeout or max(self.timeout, 120.0))
+        return CommandResult(stdout, stderr)
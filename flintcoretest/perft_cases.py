@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Tuple
 
 
@@ -24,6 +25,21 @@ class PerftExpectation:
             if len(mv) < 4:
                 raise ValueError(f"PerftExpectation '{self.name}' contains invalid move '{mv}'")
 
+    @cached_property
+    def position_command(self) -> str:
+        base = "position startpos" if self.startpos else f"position fen {self.fen}"
+        if self.moves:
+            base += " moves " + " ".join(self.moves)
+        return base
+
+    @cached_property
+    def perft_script(self) -> tuple[str, ...]:
+        return ("ucinewgame", self.position_command, f"perft {self.depth}")
+
+    @cached_property
+    def go_perft_script(self) -> tuple[str, ...]:
+        return ("ucinewgame", self.position_command, f"go perft {self.depth}")
+
 
 DEFAULT_PERFT_CASES: tuple[PerftExpectation, ...] = (
     PerftExpectation(name="startpos_depth2", depth=2, nodes=400, startpos=True),
@@ -42,3 +58,8 @@ DEFAULT_PERFT_CASES: tuple[PerftExpectation, ...] = (
         fen="rnbqkb1r/pppp1ppp/5n2/4p3/2BPP3/5N2/PPP2PPP/RNBQK2R b KQkq - 2 3",
     ),
 )
+
+# Fill the cached UCI scripts eagerly so perft calls for bundled cases never build strings at test time.
+for case in DEFAULT_PERFT_CASES:
+    _ = case.perft_script, case.go_perft_script
+del case, _
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import itertools
 import math
+import mmap
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Iterable, List, Optional, Sequence
 
 import chess
 import chess.engine
+import numpy as np
+
+# Results are folded into the LLR in batches once this many new games have arrived.
+_LLR_CHECK_INTERVAL = 8
+# 10 ** (x / 400) == exp(x * _LOG10_OVER_400); exp is cheaper than a generic pow.
+_LOG10_OVER_400 = math.log(10.0) / 400.0
+# Captures the payload of an EPD line without surrounding whitespace or a trailing "#"/";" comment;
+# blank and comment-only lines do not match.
+_EPD_STRIP = re.compile(rb"^\s*([^#;\s][^#;]*?)\s*(?:[#;].*)?$")
+# Non-empty lines split on "\n", "\r\n" or a lone "\r", the same breaks text-mode reading recognises.
+_EPD_LINE = re.compile(rb"[^\r\n]+")
 
 
 @dataclass
@@ -24,14 +42,26 @@ class SPRTBounds:
     def upper(self) -> float:
         return math.log((1.0 - self.beta) / self.alpha)
 
+    # The cached terms below assume elo0/elo1 are not modified after the first likelihood_ratio call.
+    @cached_property
+    def _p0(self) -> float:
+        return logistic_from_elo(self.elo0)
+
+    @cached_property
+    def _p1(self) -> float:
+        return logistic_from_elo(self.elo1)
+
+    @cached_property
+    def _lr_a(self) -> float:
+        return math.log(self._p1 / self._p0)
+
+    @cached_property
+    def _lr_b(self) -> float:
+        return math.log((1.0 - self._p1) / (1.0 - self._p0))
+
     def likelihood_ratio(self, score: float) -> float:
-        p0 = logistic_from_elo(self.elo0)
-        p1 = logistic_from_elo(self.elo1)
-        eps = 1e-9
-        score = min(max(score, eps), 1 - eps)
-        part1 = math.pow(p1, score) * math.pow(1 - p1, 1 - score)
-        part0 = math.pow(p0, score) * math.pow(1 - p0, 1 - score)
-        return math.log(part1 / part0)
+        # log(p1^s (1-p1)^(1-s) / (p0^s (1-p0)^(1-s))) expanded into a single multiply-add.
+        return score * self._lr_a + (1.0 - score) * self._lr_b
 
 
 @dataclass
@@ -42,6 +72,17 @@ class SPRTConfig:
     hash_mb: int = 8
     threads: int = 1
     bounds: SPRTBounds = field(default_factory=SPRTBounds)
+    workers: Optional[int] = None
+    # Clear engine state with ucinewgame before every game; disabling it lets hash entries carry over,
+    # which is faster but no longer treats games as independent samples.
+    reset_tt: bool = True
+
+    def __post_init__(self) -> None:
+        # Each worker drives two engines that alternate moves, so budget one engine's threads per core.
+        if self.workers is None:
+            self.workers = max(1, (os.cpu_count() or 1) // max(1, self.threads))
+        if self.workers < 1:
+            raise ValueError("SPRTConfig.workers must be at least 1")
 
 
 @dataclass
@@ -50,6 +91,19 @@ class EngineOptions:
     hash_mb: int = 8
 
 
+@dataclass
+class GameOutcome:
+    game_idx: int
+    white_is_a: bool
+    white_score: float
+    moves: int
+    score_symbol: str
+
+    @property
+    def score_a(self) -> float:
+        return self.white_score if self.white_is_a else 1.0 - self.white_score
+
+
 @dataclass
 class SPRTResult:
     wins_a: int
@@ -93,12 +147,12 @@ class SPRTResult:
 
 
 def logistic_from_elo(elo: float) -> float:
-    return 1.0 / (1.0 + math.pow(10.0, -elo / 400.0))
+    return 1.0 / (1.0 + math.exp(-elo * _LOG10_OVER_400))
 
 
 def elo_from_score(score: float) -> float:
     score = min(max(score, 1e-6), 1 - 1e-6)
-    return -400.0 * math.log10(1.0 / score - 1.0)
+    return -math.log(1.0 / score - 1.0) / _LOG10_OVER_400
 
 
 def elo_with_confidence(score: float, games: int, confidence: float = 0.95) -> tuple[float, float]:
@@ -108,28 +162,44 @@ def elo_with_confidence(score: float, games: int, confidence: float = 0.95) -> t
     score = min(max(score, 1e-6), 1 - 1e-6)
     elo = elo_from_score(score)
     sigma_p = math.sqrt(score * (1 - score) / games)
-    deriv = 400.0 / (math.log(10) * score * (1 - score))
+    deriv = 1.0 / (_LOG10_OVER_400 * score * (1 - score))
     margin = z * deriv * sigma_p
     return elo, margin
 
 
+def elo_with_confidence_vec(
+    scores: np.ndarray, games: np.ndarray, confidence: float = 0.95
+) -> tuple[np.ndarray, np.ndarray]:
+    scores = np.clip(np.asarray(scores, dtype=float), 1e-6, 1 - 1e-6)
+    games = np.asarray(games, dtype=float)
+    z = 1.959964 if confidence == 0.95 else 1.96
+    elo = -np.log(1.0 / scores - 1.0) / _LOG10_OVER_400
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma_p = np.sqrt(scores * (1 - scores) / games)
+    deriv = 1.0 / (_LOG10_OVER_400 * scores * (1 - scores))
+    margin = z * deriv * sigma_p
+    no_games = games == 0
+    return np.where(no_games, 0.0, elo), np.where(no_games, 0.0, margin)
+
+
 class SPRTRunner:
     def __init__(
         self,
         engine_a: Path,
         engine_b: Path,
-        openings: List[Optional[str]],
+        openings: Iterable[Optional[str]],
         config: SPRTConfig,
         name_a: str = "EngineA",
         name_b: str = "EngineB",
         options_a: EngineOptions | None = None,
         options_b: EngineOptions | None = None,
     ) -> None:
-        if not openings:
+        # Games cycle through openings in order, so anything past the first `games` entries is never used.
+        self.openings = list(itertools.islice(openings, max(1, config.games)))
+        if not self.openings:
             raise ValueError("At least one opening is required")
         self.engine_a = engine_a
         self.engine_b = engine_b
-        self.openings = openings
         self.config = config
         self.name_a = name_a
         self.name_b = name_b
@@ -143,118 +213,202 @@ class SPRTRunner:
         )
 
     def run(self) -> SPRTResult:
-        limit = chess.engine.Limit(time=self.config.movetime_s)
-        penta = [0, 0, 0, 0, 0]
+        # Imported here so that loading numba is only paid for by code that actually runs a match.
+        from ._numba_kernels import _sprt_update
+
+        config = self.config
+        bounds = config.bounds
+        scores = np.empty(config.games)
+        plies = np.empty(config.games, dtype=np.int64)
+        llr_path = np.empty(config.games)
+        outcomes: List[GameOutcome] = []
+        penta = np.zeros(5, dtype=np.int64)
         wins_a = wins_b = draws = 0
         llr = 0.0
+        checked = 0
         verdict = "in_progress"
 
-        with chess.engine.SimpleEngine.popen_uci(str(self.engine_a)) as eng_a, chess.engine.SimpleEngine.popen_uci(
-            str(self.engine_b)
-        ) as eng_b:
-            self._configure_engine(eng_a, self.options_a)
-            self._configure_engine(eng_b, self.options_b)
-
-            for game_idx in range(self.config.games):
-                opening = self.openings[game_idx % len(self.openings)]
-                board = chess.Board() if opening in (None, "startpos") else chess.Board(opening)
-                white_is_a = game_idx % 2 == 0
-                white_score, move_count, score_symbol = self._play_game(
-                    board, eng_a, eng_b, limit, white_is_a
-                )
-                score_a = white_score if white_is_a else 1.0 - white_score
-                llr += self.config.bounds.likelihood_ratio(score_a)
-                bin_idx = min(len(board.move_stack) // 20, 4)
-                penta[bin_idx] += 1
-                if score_a == 1:
-                    wins_a += 1
-                elif score_a == 0:
-                    wins_b += 1
-                else:
-                    draws += 1
-
-                total_played = wins_a + wins_b + draws
-                print(
-                    f"[Game {total_played}/{self.config.games}] "
-                    f"{'A' if white_is_a else 'B'} (white) vs "
-                    f"{'B' if white_is_a else 'A'} (black) -> {score_symbol} "
-                    f"moves={move_count} llr={llr:.3f}",
-                    flush=True,
+        # Several games per task keep each worker's engine pair warm across openings.
+        chunk_size = max(1, math.ceil(config.games / (config.workers * 4)))
+        jobs = [(game_idx, self.openings[game_idx % len(self.openings)]) for game_idx in range(config.games)]
+
+        # Chunks already running cannot be cancelled; they poll this event between games and return early,
+        # so shutting down before the last result only waits for the games in progress.
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=config.workers) as executor:
+            stop = manager.Event()
+            futures = [
+                executor.submit(
+                    _play_chunk,
+                    self.engine_a,
+                    self.engine_b,
+                    self.options_a,
+                    self.options_b,
+                    config.movetime_s,
+                    config.reset_tt,
+                    jobs[start : start + chunk_size],
+                    stop,
                 )
-
-                if llr >= self.config.bounds.upper:
-                    verdict = "accept H1"
-                    break
-                if llr <= self.config.bounds.lower:
-                    verdict = "accept H0"
-                    break
-            else:
-                verdict = "max games reached"
-
-        games_played = wins_a + wins_b + draws
-        return SPRTResult(wins_a, wins_b, draws, games_played, llr, verdict, penta)
-
-    def _configure_engine(self, engine: chess.engine.SimpleEngine, opts: EngineOptions) -> None:
-        options = {
-            "Threads": opts.threads,
-            "Hash": opts.hash_mb,
-        }
-        for key, value in options.items():
+                for start in range(0, config.games, chunk_size)
+            ]
             try:
-                engine.configure({key: value})
-            except chess.engine.EngineError:
-                continue
+                for future in as_completed(futures):
+                    for outcome in future.result():
+                        scores[len(outcomes)] = outcome.score_a
+                        plies[len(outcomes)] = outcome.moves
+                        outcomes.append(outcome)
+                    received = len(outcomes)
+                    if received - checked < _LLR_CHECK_INTERVAL and received < config.games:
+                        continue
+
+                    llr, stopped, batch_penta, batch_wins_a, batch_wins_b, batch_draws = _sprt_update(
+                        scores[checked:received],
+                        plies[checked:received],
+                        llr,
+                        bounds._lr_a,
+                        bounds._lr_b,
+                        bounds.lower,
+                        bounds.upper,
+                        llr_path[checked:received],
+                    )
+                    folded = received if stopped < 0 else checked + stopped + 1
+                    for idx in range(checked, folded):
+                        self._report(idx, outcomes[idx], float(llr_path[idx]))
+                    penta += batch_penta
+                    wins_a += batch_wins_a
+                    wins_b += batch_wins_b
+                    draws += batch_draws
+                    checked = folded
+                    if stopped >= 0:
+                        verdict = "accept H1" if llr >= bounds.upper else "accept H0"
+                        break
+            finally:
+                # Also reached on a failed chunk or Ctrl+C, which must not leave the queue playing out.
+                stop.set()
+                executor.shutdown(cancel_futures=True)
+
+        if verdict == "in_progress":
+            verdict = "max games reached"
+        games_played = wins_a + wins_b + draws
+        return SPRTResult(wins_a, wins_b, draws, games_played, float(llr), verdict, penta.tolist())
+
+    def _report(self, idx: int, outcome: GameOutcome, llr: float) -> None:
+        print(
+            f"[Game {idx + 1}/{self.config.games}] "
+            f"{'A' if outcome.white_is_a else 'B'} (white) vs "
+            f"{'B' if outcome.white_is_a else 'A'} (black) -> {outcome.score_symbol} "
+            f"moves={outcome.moves} llr={llr:.3f}",
+            flush=True,
+        )
 
-    def _play_game(
-        self,
-        board: chess.Board,
-        eng_a: chess.engine.SimpleEngine,
-        eng_b: chess.engine.SimpleEngine,
-        limit: chess.engine.Limit,
-        white_is_a: bool,
-    ) -> tuple[float, int, str]:
-        white_engine = eng_a if white_is_a else eng_b
-        black_engine = eng_b if white_is_a else eng_a
-        while not board.is_game_over(claim_draw=True):
-            engine = white_engine if board.turn == chess.WHITE else black_engine
-            try:
-                result = engine.play(board, limit)
-            except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
-                if engine is white_engine:
-                    result = 0.0
-                    break
-                result = 1.0
-                break
-            move = result.move
-            if move is None:
-                if engine is white_engine:
-                    result = 0.0
-                    break
-                result = 1.0
+
+def _play_chunk(
+    engine_a: Path,
+    engine_b: Path,
+    options_a: EngineOptions,
+    options_b: EngineOptions,
+    movetime_s: float,
+    reset_tt: bool,
+    jobs: Sequence[tuple[int, Optional[str]]],
+    stop: Any,
+) -> List[GameOutcome]:
+    limit = chess.engine.Limit(time=movetime_s)
+    outcomes: List[GameOutcome] = []
+    with chess.engine.SimpleEngine.popen_uci(str(engine_a)) as eng_a, chess.engine.SimpleEngine.popen_uci(
+        str(engine_b)
+    ) as eng_b:
+        _configure_engine(eng_a, options_a)
+        _configure_engine(eng_b, options_b)
+
+        # One board per worker, reset in place for each game rather than reallocated.
+        board = chess.Board()
+        for game_idx, opening in jobs:
+            if stop.is_set():
                 break
-            board.push(move)
-        else:
-            outcome = board.outcome(claim_draw=True)
-            if outcome is None or outcome.winner is None:
-                result = 0.5
+            if opening in (None, "startpos"):
+                board.reset()
             else:
-                result = 1.0 if outcome.winner == chess.WHITE else 0.0
-        moves = len(board.move_stack)
-        score_symbol = "1-0" if result == 1.0 else "0-1" if result == 0.0 else "1/2-1/2"
-        return result, moves, score_symbol
+                board.set_fen(opening)
+            white_is_a = game_idx % 2 == 0
+            # python-chess sends ucinewgame (pipelined with its isready) whenever the game key changes.
+            game = game_idx if reset_tt else None
+            white_score, move_count, score_symbol = _play_game(board, eng_a, eng_b, limit, white_is_a, game)
+            outcomes.append(GameOutcome(game_idx, white_is_a, white_score, move_count, score_symbol))
+    return outcomes
+
+
+def _configure_engine(engine: chess.engine.SimpleEngine, opts: EngineOptions) -> None:
+    options = {
+        "Threads": opts.threads,
+        "Hash": opts.hash_mb,
+    }
+    for key, value in options.items():
+        try:
+            engine.configure({key: value})
+        except chess.engine.EngineError:
+            continue
+
+
+def _play_game(
+    board: chess.Board,
+    eng_a: chess.engine.SimpleEngine,
+    eng_b: chess.engine.SimpleEngine,
+    limit: chess.engine.Limit,
+    white_is_a: bool,
+    game: object = None,
+) -> tuple[float, int, str]:
+    white_engine = eng_a if white_is_a else eng_b
+    black_engine = eng_b if white_is_a else eng_a
+    while not _is_game_over(board):
+        white_to_move = board.turn == chess.WHITE
+        engine = white_engine if white_to_move else black_engine
+        try:
+            result = engine.play(board, limit, game=game)
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError):
+            result = 0.0 if white_to_move else 1.0
+            break
+        move = result.move
+        if move is None:
+            result = 0.0 if white_to_move else 1.0
+            break
+        board.push(move)
+    else:
+        outcome = board.outcome(claim_draw=True)
+        if outcome is None or outcome.winner is None:
+            result = 0.5
+        else:
+            result = 1.0 if outcome.winner == chess.WHITE else 0.0
+    moves = len(board.move_stack)
+    score_symbol = "1-0" if result == 1.0 else "0-1" if result == 0.0 else "1/2-1/2"
+    return result, moves, score_symbol
 
 
-def load_openings(epd_path: Path) -> List[Optional[str]]:
+def _is_game_over(board: chess.Board) -> bool:
+    # Same answer as board.is_game_over(claim_draw=True), with the cheap terminal checks first.
+    if not any(board.generate_legal_moves()) or board.is_insufficient_material():
+        return True
+    # Fifty-move and repetition draws both need a run of reversible moves; a threefold claim needs at least
+    # seven since the last capture or pawn move, so the repetition scan is skipped until then.
+    if board.halfmove_clock < 7:
+        return False
+    return board.can_claim_draw()
+
+
+def load_openings(epd_path: Path, limit: int | None = None) -> List[Optional[str]]:
     openings: List[Optional[str]] = []
-    with epd_path.open("r", encoding="utf-8") as handle:
-        for raw in handle:
-            line = raw.split("#", 1)[0].split(";", 1)[0].strip()
-            if not line:
-                continue
-            if line.lower() == "startpos":
-                openings.append(None)
-            else:
-                openings.append(line)
+    with epd_path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for raw in _EPD_LINE.finditer(mm):
+                    if limit is not None and len(openings) >= limit:
+                        break
+                    match = _EPD_STRIP.match(raw.group())
+                    if match is None:
+                        continue
+                    line = match.group(1)
+                    if line.lower() == b"startpos":
+                        openings.append(None)
+                    else:
+                        openings.append(line.decode("utf-8"))
     if not openings:
         openings.append(None)
     return openings
@@ -36,6 +36,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--hash-mb", type=int, default=8, help="Default Hash value in MB when supported")
     parser.add_argument("--hash-a", type=int, dest="hash_a", help="Override Hash (MB) for engine A")
     parser.add_argument("--hash-b", type=int, dest="hash_b", help="Override Hash (MB) for engine B")
+    parser.add_argument("--workers", type=int, help="Games played in parallel (defaults to CPU count / --threads)")
+    parser.add_argument(
+        "--keep-hash",
+        action="store_true",
+        help="Skip ucinewgame between games so engines keep their hash tables (faster, less independent)",
+    )
     parser.add_argument("--openings", type=Path, default=default_openings, help="EPD/startpos list used to seed games")
     parser.add_argument("--sprt-elo0", type=float, default=-2.0, help="Null hypothesis Elo for SPRT")
     parser.add_argument("--sprt-elo1", type=float, default=2.0, help="Alternative hypothesis Elo for SPRT")
@@ -69,8 +75,10 @@ def main() -> None:
         hash_mb=args.hash_mb,
         threads=args.threads,
         bounds=bounds,
+        workers=args.workers,
+        reset_tt=not args.keep_hash,
     )
-    openings = load_openings(args.openings)
+    openings = load_openings(args.openings, limit=args.games)
     options_a = EngineOptions(
         threads=args.threads_a if args.threads_a is not None else args.threads,
         hash_mb=args.hash_a if args.hash_a is not None else args.hash_mb,
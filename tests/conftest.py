@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+from typing import Iterator
+
 import pytest
 
 from flintcoretest.engine_runner import EngineHarness, EngineNotFoundError
 
 
 @pytest.fixture(scope="session")
-def engine() -> EngineHarness:
+def engine() -> Iterator[EngineHarness]:
     try:
-        return EngineHarness()
+        harness = EngineHarness()
     except EngineNotFoundError as exc:
         pytest.skip(
             f"FlintCore executable is missing: {exc}. "
             "Build it via scripts/build_engine.py or set FLINTCORE_ENGINE_PATH before running tests."
         )
+    with harness:
+        yield harness
@@ -17,10 +17,10 @@ def _extract_field(summary_line: str, key: str) -> int:
 def test_bench_summary_reports_progress(engine: EngineHarness) -> None:
     result = engine.run_bench()
     summary = next(
-        (line for line in result.stdout.splitlines() if "bench summary" in line),
+        (line for line in result.stdout_lines if "bench summary" in line),
         None,
     )
-    assert summary is not None, f"Bench summary missing. Output was:\n{result.stdout}"
+    assert summary is not None, f"Bench summary missing. Output was:\n{result.stdout.decode(errors='replace')}"
     nodes = _extract_field(summary, "nodes")
     positions = _extract_field(summary, "positions")
     assert nodes > 0
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from flintcoretest import engine_runner
+from flintcoretest.engine_runner import _PERFT_RE, EngineHarness
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses shebang scripts as engines")
+
+_ECHO_ENGINE = """
+import sys
+for line in sys.stdin:
+    command = line.strip()
+    if command == "uci":
+        print("id name Echo\\nuciok", flush=True)
+    elif command == "isready":
+        print("readyok", flush=True)
+    elif command == "quit":
+        break
+"""
+
+# Answers slowly, then ignores quit.
+_STUBBORN_ENGINE = """
+import sys, time
+for line in sys.stdin:
+    if line.startswith("go"):
+        time.sleep(0.8)
+        print("nodes 20", flush=True)
+time.sleep(30)
+"""
+
+
+def _script(tmp_path: Path, body: str) -> Path:
+    path = tmp_path / "engine"
+    path.write_text(f"#!{sys.executable}\n{body}")
+    path.chmod(0o755)
+    return path
+
+
+def test_engine_that_exits_immediately_raises(tmp_path: Path) -> None:
+    harness = EngineHarness(_script(tmp_path, "raise SystemExit(3)\n"), timeout=10.0)
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        harness._send("isready")
+    assert excinfo.value.returncode == 3
+
+
+@pytest.mark.parametrize("select_pipes", [True, False])
+def test_harness_reads_engine_output(monkeypatch, tmp_path: Path, select_pipes: bool) -> None:
+    monkeypatch.setattr(engine_runner, "_SELECT_PIPES", select_pipes)
+    with EngineHarness(_script(tmp_path, _ECHO_ENGINE), timeout=10.0) as harness:
+        harness._send("uci")
+        assert harness._read_until(lambda line: line == b"uciok") == [b"id name Echo", b"uciok"]
+
+
+def test_streaming_timeout_covers_scan_and_shutdown(tmp_path: Path) -> None:
+    harness = EngineHarness(_script(tmp_path, _STUBBORN_ENGINE), timeout=1.0)
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(harness._run_uci_streaming_async(["go perft 1"], _PERFT_RE.match))
+    assert time.monotonic() - start < 1.5
+
+
+def test_engine_closing_stdout_still_times_out(tmp_path: Path) -> None:
+    engine = _script(tmp_path, "import os, time\nos.close(1)\ntime.sleep(30)\n")
+    harness = EngineHarness(engine, timeout=1.0)
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        harness._send("isready")
+    assert time.monotonic() - start < 5.0
+    assert harness._proc is None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 
+from flintcoretest.engine_runner import _PERFT_RE
 from flintcoretest.perft_cases import DEFAULT_PERFT_CASES, PerftExpectation
 
 
@@ -13,3 +14,18 @@ def test_perft_command(engine, case: PerftExpectation) -> None:
 def test_go_perft_matches_reference(engine) -> None:
     target = next(case for case in DEFAULT_PERFT_CASES if case.name == "startpos_depth3")
     assert engine.go_perft(target) == target.nodes
+
+
+def test_gather_perft_matches_reference(engine) -> None:
+    assert engine.gather_perft(DEFAULT_PERFT_CASES) == [case.nodes for case in DEFAULT_PERFT_CASES]
+
+
+def test_perft_regex_matches_only_totals() -> None:
+    assert int(_PERFT_RE.match(b"Total nodes: 8902").group(1)) == 8902
+    assert int(_PERFT_RE.match(b"nodes 20").group(1)) == 20
+    assert _PERFT_RE.match(b"a2a3: 380") is None
+    assert _PERFT_RE.match(b"Nodes searched: 400") is None
+    assert int(_PERFT_RE.match(b"total nodes: 8902 \r").group(1)) == 8902
+    assert _PERFT_RE.match(b"nodes 20 foo") is None
+    assert _PERFT_RE.match(b"Total nodes: 123abc") is None
+    assert _PERFT_RE.match(b"info depth 1 nodes 20 nps 1000") is None
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from flintcoretest.engine_runner import _spawn_engine
+
+
+def test_spawn_echoes_stdin() -> None:
+    stdout, stderr = _spawn_engine(
+        [sys.executable, "-c", "import sys; data = sys.stdin.read(); sys.stdout.write(data); sys.stderr.write('err')"],
+        b"uci\nisready\nquit\n",
+        timeout=10.0,
+    )
+    assert stdout == b"uci\nisready\nquit\n"
+    assert stderr == b"err"
+
+
+def test_spawn_raises_on_nonzero_exit() -> None:
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        _spawn_engine([sys.executable, "-c", "print('partial'); raise SystemExit(3)"], b"", timeout=10.0)
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.output.strip() == b"partial"
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        "import time; time.sleep(10)",
+        # The deadline must also hold once the child has closed its output but keeps running.
+        "import os, time; os.close(1); os.close(2); time.sleep(10)",
+    ],
+)
+def test_spawn_times_out(script: str) -> None:
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        _spawn_engine([sys.executable, "-c", script], b"", timeout=0.5)
+    assert time.monotonic() - start < 5.0
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc/self/status")
+def test_spawn_restores_default_signal_handling() -> None:
+    stdout, _ = _spawn_engine(["/bin/cat", "/proc/self/status"], b"", timeout=10.0)
+    sig_ign = next(line for line in stdout.decode().splitlines() if line.startswith("SigIgn:"))
+    ignored = int(sig_ign.split()[1], 16)
+    for signum in (signal.SIGPIPE, signal.SIGXFSZ):
+        assert not ignored & (1 << (signum - 1)), f"{signum.name} is still ignored"
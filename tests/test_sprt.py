@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import chess
+import pytest
+
+from flintcoretest import sprt
+from flintcoretest.sprt import GameOutcome, SPRTBounds, SPRTConfig, SPRTRunner, _is_game_over
+
+
+def _stub_runner(monkeypatch, score_of, played: list[int], slow_later_chunks: bool = False) -> None:
+    lock = threading.Lock()
+
+    def play_chunk(engine_a, engine_b, options_a, options_b, movetime_s, reset_tt, jobs, stop):
+        outcomes = []
+        for game_idx, _opening in jobs:
+            if stop.is_set():
+                break
+            if slow_later_chunks and jobs[0][0] > 0:
+                time.sleep(0.01)
+            with lock:
+                played.append(game_idx)
+            white_is_a = game_idx % 2 == 0
+            score_a = score_of(game_idx)
+            white_score = score_a if white_is_a else 1.0 - score_a
+            outcomes.append(GameOutcome(game_idx, white_is_a, white_score, 40, "?"))
+        # Later chunks finish first so results arrive out of submission order.
+        time.sleep(0.01 * (len(jobs) and 1 / (1 + jobs[0][0])))
+        return outcomes
+
+    monkeypatch.setattr(sprt, "_play_chunk", play_chunk)
+    monkeypatch.setattr(sprt, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+
+def test_runner_folds_every_result_without_verdict(monkeypatch, capsys) -> None:
+    scores = [1.0, 0.0, 0.5, 0.5, 1.0, 0.0] * 5
+    played: list[int] = []
+    _stub_runner(monkeypatch, scores.__getitem__, played)
+    bounds = SPRTBounds(alpha=1e-9, beta=1e-9)
+    config = SPRTConfig(games=len(scores), bounds=bounds, workers=2)
+
+    result = SPRTRunner(Path("a"), Path("b"), [None], config).run()
+
+    assert sorted(played) == list(range(len(scores)))
+    assert result.verdict == "max games reached"
+    assert result.games_played == len(scores)
+    assert (result.wins_a, result.wins_b, result.draws) == (10, 10, 10)
+    assert result.penta == [0, 0, len(scores), 0, 0]
+    assert result.llr == pytest.approx(math.fsum(bounds.likelihood_ratio(score) for score in scores))
+    reported = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[Game ")]
+    assert [line.split("]")[0] for line in reported] == [f"[Game {idx + 1}/{len(scores)}" for idx in range(len(scores))]
+
+
+def test_runner_stops_at_bound(monkeypatch, capsys) -> None:
+    played: list[int] = []
+    _stub_runner(monkeypatch, lambda game_idx: 1.0, played, slow_later_chunks=True)
+    bounds = SPRTBounds(elo0=0.0, elo1=200.0)
+    config = SPRTConfig(games=400, bounds=bounds, workers=2)
+
+    result = SPRTRunner(Path("a"), Path("b"), [None], config).run()
+
+    needed = math.ceil(bounds.upper / bounds.likelihood_ratio(1.0))
+    assert result.verdict == "accept H1"
+    assert result.games_played == result.wins_a == needed
+    assert result.llr >= bounds.upper
+    # The first chunk crosses the bound while the second is still playing; that one stops early and
+    # nothing queued behind it starts.
+    chunk_size = math.ceil(config.games / (config.workers * 4))
+    assert len(played) < 2 * chunk_size
+    assert len([line for line in capsys.readouterr().out.splitlines() if line.startswith("[Game ")]) == needed
+
+
+
+def test_runner_stops_when_a_chunk_fails(monkeypatch) -> None:
+    def score_of(game_idx: int) -> float:
+        if game_idx == 0:
+            raise ValueError("bad opening")
+        return 0.5
+
+    played: list[int] = []
+    _stub_runner(monkeypatch, score_of, played, slow_later_chunks=True)
+    config = SPRTConfig(games=400, workers=2)
+
+    with pytest.raises(ValueError, match="bad opening"):
+        SPRTRunner(Path("a"), Path("b"), [None], config).run()
+
+    # Only the chunk running beside the failed one plays on, and just until it sees the stop event.
+    chunk_size = math.ceil(config.games / (config.workers * 4))
+    assert len(played) < 2 * chunk_size
+
+_KNIGHT_SHUFFLE = ["g1f3", "g8f6", "f3g1", "f6g8"] * 2
+
+
+@pytest.mark.parametrize(
+    ("fen", "moves"),
+    [
+        # Threefold repetition; after seven plies the claim is only available through the next move.
+        (chess.STARTING_FEN, _KNIGHT_SHUFFLE),
+        # A FEN halfmove clock past the gate without the move history to back a repetition claim.
+        ("4k3/8/8/8/8/8/R7/4K3 w - - 40 60", ["a2b2", "e8d8", "b2a2", "d8e8"] * 2),
+        # Fifty-move claim reached from a high starting clock.
+        ("4k3/8/8/8/8/8/R7/4K3 w - - 97 80", ["a2b2", "e8d8", "b2c2", "d8e8"]),
+        # Stalemate.
+        ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", []),
+        # Insufficient material.
+        ("8/8/8/4k3/8/8/8/4K3 w - - 0 1", []),
+        ("8/8/8/4k3/8/8/8/4KB2 w - - 0 1", ["f1e2"]),
+    ],
+)
+def test_is_game_over_matches_python_chess(fen: str, moves: list[str]) -> None:
+    board = chess.Board(fen)
+    assert _is_game_over(board) == board.is_game_over(claim_draw=True)
+    for move in moves:
+        board.push_uci(move)
+        assert _is_game_over(board) == board.is_game_over(claim_draw=True), board.move_stack
@@ -1,6 +1,18 @@
 from __future__ import annotations
 
-from flintcoretest.sprt import elo_from_score, elo_with_confidence, logistic_from_elo
+from pathlib import Path
+
+import numpy as np
+
+from flintcoretest._numba_kernels import _sprt_update
+from flintcoretest.sprt import (
+    SPRTBounds,
+    elo_from_score,
+    elo_with_confidence,
+    elo_with_confidence_vec,
+    load_openings,
+    logistic_from_elo,
+)
 
 
 def test_logistic_round_trip() -> None:
@@ -16,3 +28,53 @@ def test_confidence_interval_monotonicity() -> None:
     assert margin > 0
     elo_more, margin_more = elo_with_confidence(0.55, 800)
     assert margin_more < margin
+
+
+def test_vectorised_confidence_matches_scalar() -> None:
+    scores = np.array([0.3, 0.5, 0.55, 0.9])
+    games = np.array([50, 200, 800, 0])
+    elos, margins = elo_with_confidence_vec(scores, games)
+    for score, n, elo, margin in zip(scores, games, elos, margins):
+        expected_elo, expected_margin = elo_with_confidence(float(score), int(n))
+        assert abs(elo - expected_elo) < 1e-9
+        assert abs(margin - expected_margin) < 1e-9
+
+
+def test_sprt_update_stops_at_first_bound_crossing() -> None:
+    bounds = SPRTBounds(elo0=0.0, elo1=5.0)
+    scores = np.array([1.0, 1.0, 0.0, 0.5, 1.0])
+    plies = np.array([10, 45, 90, 120, 30], dtype=np.int64)
+    llr_out = np.empty(len(scores))
+    expected = np.cumsum([bounds.likelihood_ratio(score) for score in scores])
+
+    llr, stopped, penta, wins_a, wins_b, draws = _sprt_update(
+        scores, plies, 0.0, bounds._lr_a, bounds._lr_b, bounds.lower, bounds.upper, llr_out
+    )
+    assert stopped == -1
+    assert np.allclose(llr_out, expected)
+    assert abs(llr - expected[-1]) < 1e-12
+    assert penta.tolist() == [1, 1, 1, 0, 2]
+    assert (wins_a, wins_b, draws) == (3, 1, 1)
+
+    llr, stopped, penta, wins_a, wins_b, draws = _sprt_update(
+        scores, plies, 0.0, bounds._lr_a, bounds._lr_b, bounds.lower, expected[1], llr_out
+    )
+    assert stopped == 1
+    assert penta.tolist() == [1, 0, 1, 0, 0]
+    assert (wins_a, wins_b, draws) == (2, 0, 0)
+
+
+def test_load_openings_strips_comments_and_honours_limit(tmp_path: Path) -> None:
+    epd = tmp_path / "book.epd"
+    epd.write_text("# header\nstartpos ; bm e4\n\n8/8/8/8/8/8/8/K6k w - - 0 1 # bare kings\nextra\n")
+    assert load_openings(epd) == [None, "8/8/8/8/8/8/8/K6k w - - 0 1", "extra"]
+    assert load_openings(epd, limit=2) == [None, "8/8/8/8/8/8/8/K6k w - - 0 1"]
+    empty = tmp_path / "empty.epd"
+    empty.write_bytes(b"")
+    assert load_openings(empty) == [None]
+
+
+def test_load_openings_accepts_any_line_ending(tmp_path: Path) -> None:
+    epd = tmp_path / "book.epd"
+    epd.write_bytes(b"startpos\r8/8/8/8/8/8/8/K6k w - - 0 1 # cr\r\nextra\n\rlast")
+    assert load_openings(epd) == [None, "8/8/8/8/8/8/8/K6k w - - 0 1", "extra", "last"]
@@ -21,5 +21,5 @@ def test_uci_handshake_reports_metadata(engine: EngineHarness) -> None:
 def test_search_returns_legal_move(engine: EngineHarness) -> None:
     result = engine.run_simple_search(moves=("e2e4", "e7e5"), depth=2)
     line = _line_with_prefix(result, "bestmove ")
-    assert line is not None, f"bestmove missing in output:\n{result.stdout}"
+    assert line is not None, f"bestmove missing in output:\n{result.stdout.decode(errors='replace')}"
     assert line.split()[1] != "0000", "engine returned null move"